@@ -2,10 +2,21 @@
 Skylab2IAI - A Python library for accessing and analyzing Skylab mission data.
 """
 
-__version__ = "0.0.10"
-
-from .catalog.catalog import Skylab2iaiCatalog
+__version__ = "0.0.23"
 
 __all__ = [
     "Skylab2iaiCatalog",
 ]
+
+
+def __getattr__(name):
+    # pandas and requests are only imported once the catalog is first used
+    if name == "Skylab2iaiCatalog":
+        from .catalog.catalog import Skylab2iaiCatalog
+        globals()[name] = Skylab2iaiCatalog
+        return Skylab2iaiCatalog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,17 +1,36 @@
+import functools
+import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import UnsupportedOperation
 from pathlib import Path
 from typing import Optional
 
+import shutil
 import ssl
+import threading
 
 import pandas as pd
 import requests
 import urllib3
 from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+logger = logging.getLogger(__name__)
+
+_MAX_DOWNLOAD_WORKERS = 16
+_POOL_SIZE = _MAX_DOWNLOAD_WORKERS
+_DOWNLOAD_TIMEOUT = (5, 60)
+_COPY_BUFFER_SIZE = 1024 * 1024
+_DEFAULT_OUTPUT_DIR = './fits_downloads'
+
+# Arrow-backed strings when pyarrow is installed, pandas' own string dtype otherwise
+try:
+    _STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    _STRING_DTYPE = pd.StringDtype("python")
+
 
 class _NoSSLVerifyAdapter(HTTPAdapter):
     """HTTPAdapter that bypasses SSL certificate verification at the connection pool level."""
@@ -23,20 +42,42 @@ class _NoSSLVerifyAdapter(HTTPAdapter):
         return super().init_poolmanager(*args, **kwargs)
 
 
+def _create_session():
+    # A single pooled session lets every download reuse kept-alive connections
+    session = requests.Session()
+    adapter = _NoSSLVerifyAdapter(
+        pool_connections=_POOL_SIZE,
+        pool_maxsize=_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _prepare_output_dir(output_dir):
+    # A single mkdir call both checks for and creates the directory
+    output_path = Path(output_dir if output_dir is not None else _DEFAULT_OUTPUT_DIR)
+    output_path.mkdir(parents=True, exist_ok=True)
+    return output_path
+
+
 class Skylab2iaiCatalog:
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
+        # Only the very first construction takes the lock; later calls return straight away
         if cls._instance is None:
-            cls._instance = super(Skylab2iaiCatalog, cls).__new__(cls)
-            cls._instance._repository = None
+            with cls._lock:
+                if cls._instance is None:
+                    from ..storage.plate_frame import _SkylabPlateStorage
+                    instance = super(Skylab2iaiCatalog, cls).__new__(cls)
+                    instance._repository = _SkylabPlateStorage()
+                    instance._session = _create_session()
+                    cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        if self._repository is None:
-            from ..storage.plate_frame import _SkylabPlateStorage
-            self._repository = _SkylabPlateStorage()
-
     @property
     def __repository(self):
         return self._repository
@@ -44,8 +85,11 @@ class Skylab2iaiCatalog:
     def get_plate_frame(self, plate_frame_name: str):
         return self.__repository.get_plate_frame(plate_frame_name)
 
-    def get_plate_frames(self):
-        return self.__repository.get_plate_frames()
+    def get_plate_frames(self, copy: bool = True):
+        return self.__repository.get_plate_frames(copy=copy)
+
+    def get_fits_link(self, plate_frame_name: str):
+        return self.__repository.get_link_fts(plate_frame_name)
 
     def get_plate_frames_by_plate(self, plate_name: str):
         return self.__repository.get_plate_frames_by_plate(plate_name)
@@ -57,92 +101,110 @@ class Skylab2iaiCatalog:
         """
         Download FITS files for the specified plate frames using parallel processing.
         
+        Duplicate plate frame names are collapsed, so each frame is looked up and downloaded once.
+
         Args:
             plate_names: A tuple of plate frame names to download
             output_dir: Directory to save downloaded files (default: './fits_downloads')
-            max_workers: Maximum number of parallel downloads (default: min(32, cpu_count + 4))
+            max_workers: Maximum number of parallel downloads (default: min(16, number of files))
             
         Returns:
-            A tuple containing (DataFrame of plate frames, list of downloaded file paths)
+            A tuple containing (DataFrame of plate frames, list of pathlib.Path objects for the downloaded files)
         """
-        # Setup output directory
-        if output_dir is None:
-            output_dir = './fits_downloads'
+        # Drop repeated names while keeping the requested order
+        plate_names = tuple(dict.fromkeys(plate_names))
 
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        # Setup output directory
+        output_path = _prepare_output_dir(output_dir)
 
         # Initialize result containers
-        result_frames_list = []
+        result_positions = []
         downloaded_files = []
 
+        # Resolve all plate frames with a single query
+        plate_frames = self.__repository.get_plate_frames_in(plate_names)
+        positions_by_name = {name: position for position, name in enumerate(plate_frames['NAME'])}
+        links = plate_frames['LINK_FTS'].to_numpy() if 'LINK_FTS' in plate_frames.columns else None
+
         # Prepare download tasks
         download_tasks = []
         for plate_name in plate_names:
-            try:
-                plate_frame = self.__repository.get_plate_frame(plate_name)
+            position = positions_by_name.get(plate_name)
 
-                if plate_frame.empty:
-                    print(f"Warning: Plate frame '{plate_name}' not found in database")
-                    continue
+            if position is None:
+                logger.warning("Plate frame '%s' not found in database", plate_name)
+                continue
 
-                # Add this frame to our results
-                result_frames_list.append(plate_frame)
+            # Add this frame to our results
+            result_positions.append(position)
 
-                # Get the FITS link
-                if 'LINK_FTS' not in plate_frame.columns:
-                    print(f"Warning: No LINK_FTS column for plate frame '{plate_name}'")
-                    continue
+            # Get the FITS link
+            if links is None:
+                logger.warning("No LINK_FTS column for plate frame '%s'", plate_name)
+                continue
 
-                link_fits = plate_frame.iloc[0]['LINK_FTS']
-                if not link_fits:
-                    print(f"Warning: Empty LINK_FTS for plate frame '{plate_name}'")
-                    continue
+            link_fits = links[position]
+            if pd.isna(link_fits) or not link_fits:
+                logger.warning("Empty LINK_FTS for plate frame '%s'", plate_name)
+                continue
 
-                download_tasks.append((link_fits, output_path, plate_name))
+            download_tasks.append((link_fits, plate_name))
 
-            except Exception as e:
-                print(f"Error processing plate frame '{plate_name}': {str(e)}")
-
-        # Download files in parallel using ThreadPoolExecutor
+        # Download files in parallel
         if download_tasks:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all download tasks
-                future_to_plate = {
-                    executor.submit(self._download_single_file, url, output_dir, plate_name): plate_name
-                    for url, output_dir, plate_name in download_tasks
-                }
-
-                # Collect results as they complete
-                for future in as_completed(future_to_plate):
-                    plate_name = future_to_plate[future]
-                    try:
-                        file_path = future.result()
-                        if file_path:
-                            downloaded_files.append(file_path)
-                    except Exception as e:
-                        print(f"Error downloading file for '{plate_name}': {str(e)}")
-
-        # Combine all frames into a single DataFrame
-        result_df = pd.DataFrame()
-        if result_frames_list:
-            # If we have only one frame, just return it directly
-            if len(result_frames_list) == 1:
-                result_df = result_frames_list[0]
-            else:
-                # Otherwise try to concatenate
-                try:
-                    result_df = pd.concat(result_frames_list, ignore_index=True)
-                except Exception as concat_error:
-                    print(f"Error combining DataFrames: {str(concat_error)}")
-                    # If concat fails, return the first frame
-                    result_df = result_frames_list[0]
+            downloaded_files = self._download_files(download_tasks, output_path, max_workers)
+
+        # Keep the result rows in the order they were requested
+        result_df = plate_frames.iloc[result_positions].reset_index(drop=True)
 
         return result_df, downloaded_files
 
+    def _download_files(self, download_tasks, output_dir, max_workers=None):
+        """
+        Download a batch of files in parallel using a ThreadPoolExecutor.
+
+        Downloaded paths are returned in the same order as their tasks, whatever order they finish in.
+
+        Args:
+            download_tasks: A list of (url, file_prefix) tuples
+            output_dir: Directory (a pathlib.Path) to save every file in
+            max_workers: Maximum number of parallel downloads (default: min(16, number of files))
+
+        Returns:
+            A list of pathlib.Path objects for the downloaded files, in task order
+        """
+        # An empty batch needs no pool, and would otherwise size one with zero workers
+        if not download_tasks:
+            return []
+
+        # Never start more threads than there are files, nor more than the connection pool can serve
+        if max_workers is None:
+            max_workers = min(_MAX_DOWNLOAD_WORKERS, len(download_tasks))
+
+        # One slot per task keeps the results in task order whatever order they finish in
+        results = [None] * len(download_tasks)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all download tasks
+            download = functools.partial(self._download_single_file, output_dir=output_dir)
+            futures = []
+            for index, (url, plate_name) in enumerate(download_tasks):
+                future = executor.submit(download, url=url, file_prefix=plate_name)
+                future.index = index
+                future.plate_name = plate_name
+                futures.append(future)
+
+            # Collect results as they complete
+            for future in as_completed(futures):
+                try:
+                    results[future.index] = future.result()
+                except Exception as e:
+                    logger.error("Error downloading FITS file for '%s': %s", future.plate_name, e)
+
+        return [file_path for file_path in results if file_path is not None]
+
     def _download_single_file(self, url, output_dir, file_prefix):
         """
-        Helper method to download a single file from a URL
+        Helper method to download a single file from a URL, skipping files that are already present
         
         Args:
             url: The URL to download from
@@ -150,82 +212,84 @@ class Skylab2iaiCatalog:
             file_prefix: Prefix for the filename
             
         Returns:
-            Path to the downloaded file or None if download failed
+            pathlib.Path of the downloaded file or None if download failed
         """
+        # Prepare the output file path
+        file_name = f"{file_prefix}.fits"
+        file_path = output_dir / file_name
+        partial_path = output_dir / f"{file_name}.part"
+
         try:
-            print(f"Downloading FITS file from {url}")
+            # Files from a previous run are only renamed into place once complete
+            if file_path.exists() and file_path.stat().st_size > 0:
+                logger.debug("Already downloaded: %s", file_path)
+                return file_path
+
+            logger.debug("Downloading FITS file from %s", url)
 
             # Make the HTTP request bypassing SSL verification
-            session = requests.Session()
-            session.mount('https://', _NoSSLVerifyAdapter())
-            response = session.get(url, stream=True, verify=False)
-            response.raise_for_status()
+            with self._session.get(url, stream=True, verify=False, timeout=_DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
 
-            # Prepare the output file path
-            file_name = f"{file_prefix}.fits"
-            file_path = output_dir / file_name
+                # Stream the body straight to disk with a large buffer
+                with open(partial_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=_COPY_BUFFER_SIZE)
 
-            # Write the file
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            partial_path.replace(file_path)
 
-            print(f"Successfully downloaded: {file_path}")
-            return str(file_path)
+            logger.info("Successfully downloaded: %s", file_path)
+            return file_path
 
         except Exception as e:
-            print(f"Error downloading file: {str(e)}")
+            logger.error("Error downloading file from %s: %s", url, e)
+            # Never leave a truncated body behind
+            partial_path.unlink(missing_ok=True)
             return None
 
     def download_fits_plate_frames_from_custom_query(self, query: str, output_dir: Optional[str] = None, max_workers: Optional[int] = None):
         """
         Download FITS files from a custom query using parallel processing.
         
+        Rows that repeat a plate frame are downloaded once, and rows without a FITS link are skipped.
+
         Args:
             query: SQL query to retrieve plate frames
             output_dir: Directory to save downloaded files (default: './fits_downloads')
-            max_workers: Maximum number of parallel downloads (default: min(32, cpu_count + 4))
+            max_workers: Maximum number of parallel downloads (default: min(16, number of files))
             
         Returns:
-            A tuple containing (DataFrame of plate frames, list of downloaded file paths)
+            A tuple containing (DataFrame of plate frames, list of pathlib.Path objects for the downloaded files)
         """
-        if output_dir is None:
-            output_dir = './fits_downloads'
-
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        downloaded_files = []
+        output_path = _prepare_output_dir(output_dir)
 
         plate_frames = self._repository.get_from_custom_query(query)
 
         if plate_frames.empty:
             raise UnsupportedOperation(f"Warning: No plate frames found for query '{query}'")
 
-        # Prepare download tasks
-        download_tasks = []
-        for index, row in plate_frames.iterrows():
-            plate_frame_name = row["NAME"]
-            link_fit = row["LINK_FTS"]
-            download_tasks.append((link_fit, output_path, plate_frame_name))
+        missing_columns = [column for column in ("NAME", "LINK_FTS") if column not in plate_frames.columns]
+        if missing_columns:
+            raise UnsupportedOperation(
+                f"Query must select the {', '.join(missing_columns)} column(s) to download FITS files"
+            )
 
-        # Download files in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all download tasks
-            future_to_plate = {
-                executor.submit(self._download_single_file, url, output_dir, plate_name): plate_name
-                for url, output_dir, plate_name in download_tasks
-            }
+        # Convert the identifier columns once instead of leaving them as generic objects
+        plate_frames = plate_frames.astype({"NAME": _STRING_DTYPE, "LINK_FTS": _STRING_DTYPE})
 
-            # Collect results as they complete
-            for future in as_completed(future_to_plate):
-                plate_name = future_to_plate[future]
-                try:
-                    file_path = future.result()
-                    if file_path:
-                        downloaded_files.append(file_path)
-                except Exception as e:
-                    print(f"Error downloading FITS file for '{plate_name}': {str(e)}")
+        # Prepare download tasks from plain row tuples, fetching each frame once even if the query repeats it
+        download_tasks = []
+        unique_links = plate_frames[["NAME", "LINK_FTS"]].drop_duplicates("NAME")
+        for plate_frame_name, link_fit in unique_links.itertuples(index=False, name=None):
+            if pd.isna(link_fit) or not link_fit:
+                logger.warning("Empty LINK_FTS for plate frame '%s'", plate_frame_name)
+                continue
+            download_tasks.append((link_fit, plate_frame_name))
+
+        # Download files in parallel
+        downloaded_files = []
+        if download_tasks:
+            downloaded_files = self._download_files(download_tasks, output_path, max_workers)
 
         return plate_frames, downloaded_files
 
@@ -1,58 +1,156 @@
+import functools
+import re
+import threading
 from io import UnsupportedOperation
 from typing import final
 
+import numpy as np
 import pandas as pd
 
 from .sql_connection import _SqlStorage
 
+# Comments and stacked statements count as injection; REPLACE is only a statement at the start,
+# elsewhere it is SQLite's string function
+_FORBIDDEN_OPERATIONS = "DELETE|UPDATE|INSERT|DROP|ALTER|CREATE|TRUNCATE"
+_FORBIDDEN_SQL = re.compile(
+    r"(--|/\*|;\s*\S)"
+    rf"|\b({_FORBIDDEN_OPERATIONS})\b"
+    r"|^\s*(REPLACE)\b",
+    re.IGNORECASE,
+)
+# For a plain SELECT only the keyword alternative of _FORBIDDEN_SQL can still match
+_FORBIDDEN_KEYWORDS = re.compile(rf"\b(?:{_FORBIDDEN_OPERATIONS})\b", re.IGNORECASE)
+
+_LOOKUP_CACHE_SIZE = 1024
+
 
 @final
 class _SkylabPlateStorage:
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(_SkylabPlateStorage, cls).__new__(cls)
-            cls._instance._connection = None
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(_SkylabPlateStorage, cls).__new__(cls)
+                    instance._connection = _SqlStorage()
+                    instance._all_frames_cache = None
+                    instance._name_index = None
+                    instance._plate_map = None
+                    instance._plate_offsets = None
+                    instance._plate_positions = None
+                    # Bound per instance so the caches are keyed by the argument alone and die with the singleton
+                    instance._frame_by_name = functools.lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(instance._lookup_by_name)
+                    instance._frames_by_plate = functools.lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(instance._lookup_by_plate)
+                    cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        if self._connection is None:
-            self._connection = _SqlStorage()
-
     @property
     def __connection(self):
         return self._connection
 
+    @property
+    def columns(self):
+        return list(self.__connection.plate_frame_columns)
+
+    def _read_sql(self, query: str, params=None, columns=None):
+        # Straight from the sqlite3 cursor into one DataFrame, without pandas' generic SQL layer
+        cursor = self.__connection.db.execute(query, params or ())
+        rows = cursor.fetchall()
+        if columns is None:
+            columns = [description[0] for description in cursor.description]
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def __read_plate_frames(self):
+        # Column names come from the cached schema instead of the cursor's description
+        return self._read_sql("SELECT * FROM plate_frame", columns=self.columns)
+
+    def __load_plate_frames(self):
+        # The embedded database is read-only, so the table is read once per process
+        if self._all_frames_cache is None:
+            frames = self.__read_plate_frames()
+            self._build_indexes(frames)
+            self._all_frames_cache = frames
+        return self._all_frames_cache
+
+    def _build_indexes(self, frames: pd.DataFrame):
+        # Hash indexes from key to row position turn every lookup into a dict probe
+        self._name_index = {name: position for position, name in enumerate(frames["NAME"].to_numpy())}
+        self._build_plate_index(frames["PLATE_ID"])
+
+    def _build_plate_index(self, plate_ids: pd.Series):
+        # Plate lookups are served here and never reach SQLite; the idx_plate_frame_plate_id index
+        # shipped in skylab-data.db only speeds up custom queries that filter on PLATE_ID.
+        # Integer codes stay internal to the index; the cached table keeps its plain string column
+        plate_ids = pd.Categorical(plate_ids)
+        # CSR layout: the rows of plate i are positions[offsets[i]:offsets[i + 1]], all in one contiguous array
+        codes = plate_ids.codes
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(plate_ids.categories))
+        offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        # Rows without a plate sort first with code -1 and are left out
+        self._plate_positions = order[len(codes) - offsets[-1]:].astype(np.intp)
+        self._plate_offsets = offsets
+        self._plate_map = {plate_id: code for code, plate_id in enumerate(plate_ids.categories)}
+
+    def _lookup_by_name(self, name: str):
+        frames = self.__load_plate_frames()
+        position = self._name_index.get(name)
+        if position is None:
+            return frames.iloc[:0].copy()
+        return frames.iloc[[position]].reset_index(drop=True)
+
+    def _lookup_by_plate(self, plate_name: str):
+        frames = self.__load_plate_frames()
+        code = self._plate_map.get(plate_name)
+        if code is None:
+            return frames.iloc[:0].copy()
+        positions = self._plate_positions[self._plate_offsets[code]:self._plate_offsets[code + 1]]
+        return frames.iloc[positions].reset_index(drop=True)
+
     def get_plate_frame(self, name: str):
-        return pd.read_sql_query("SELECT * FROM plate_frame WHERE name = ?", self.__connection.db, params=(name,))
+        # Repeat lookups reuse the memoized frame; the copy keeps it safe from callers' edits
+        return self._frame_by_name(name).copy()
 
-    def get_plate_frames(self):
-        return pd.read_sql_query("SELECT * FROM plate_frame", self.__connection.db)
+    def get_plate_frames(self, copy: bool = True):
+        # copy=False hands out the cached table itself, for callers that only read it
+        frames = self.__load_plate_frames()
+        return frames.copy() if copy else frames
 
     def get_plate_frames_by_plate(self, plate_name: str):
-        return pd.read_sql_query("SELECT * FROM plate_frame WHERE PLATE_ID = ?", self.__connection.db,
-                                 params=(plate_name,))
+        return self._frames_by_plate(plate_name).copy()
 
-    def _avoid_sql_injection(self, query: str):
-        if query.__contains__("--"):
-            raise UnsupportedOperation("SQL injection is not allowed")
-
-    def __avoid_sql_delete(self, query: str):
-        if query.__contains__("DELETE"):
-            raise UnsupportedOperation("Delete operation is not allowed")
+    def get_link_fts(self, name: str):
+        # Served from the cached table like the other lookups, without a SQL round trip
+        frames = self.__load_plate_frames()
+        position = self._name_index.get(name)
+        if position is None:
+            return None
+        link = frames["LINK_FTS"].iat[position]
+        return None if pd.isna(link) else link
 
-    def __avoid_sql_update(self, query: str):
-        if query.__contains__("UPDATE"):
-            raise UnsupportedOperation("Update operation is not allowed")
+    def get_plate_frames_in(self, names: tuple):
+        frames = self.__load_plate_frames()
+        # Row positions go straight into an intp array, the form iloc gathers from without conversion
+        name_index = self._name_index
+        positions = np.fromiter((name_index[name] for name in dict.fromkeys(names) if name in name_index), dtype=np.intp)
+        return frames.iloc[positions].reset_index(drop=True)
 
-    def __avoid_sql_insert(self, query: str):
-        if query.__contains__("INSERT"):
-            raise UnsupportedOperation("Insert operation is not allowed")
+    def _avoid_forbidden_sql(self, query: str):
+        # Fast path: substring checks and a keyword-only scan clear the usual SELECT without the full classifier
+        if (query.lstrip()[:6].lower() == "select" and ";" not in query and "--" not in query
+                and "/*" not in query and _FORBIDDEN_KEYWORDS.search(query) is None):
+            return
+        match = _FORBIDDEN_SQL.search(query)
+        if match is None:
+            return
+        if match.group(1):
+            raise UnsupportedOperation("SQL injection is not allowed")
+        operation = match.group(2) or match.group(3)
+        raise UnsupportedOperation(f"{operation.capitalize()} operation is not allowed")
 
     def get_from_custom_query(self, query: str, params: tuple = None):
-        self._avoid_sql_injection(query)
-        self.__avoid_sql_delete(query)
-        self.__avoid_sql_update(query)
-        self.__avoid_sql_insert(query)
-        return pd.read_sql_query(query, self.__connection.db, params=params)
+        self._avoid_forbidden_sql(query)
+        return self._read_sql(query, params)
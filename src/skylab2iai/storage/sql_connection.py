@@ -1,22 +1,37 @@
 import sqlite3
+import threading
 from pathlib import Path
 from typing import final
 
+_PRAGMAS = (
+    "mmap_size=268435456",
+    "cache_size=-65536",
+    "temp_store=MEMORY",
+    "query_only=1",
+)
+
 
 @final
 class _SqlStorage:
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(_SqlStorage, cls).__new__(cls)
-            cls._instance.db = None
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(_SqlStorage, cls).__new__(cls)
+                    db_path = Path(__file__).parent / 'skylab-data.db'
+                    # Read-only, autocommit and shareable with the download worker threads
+                    instance.db = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False,
+                                                  isolation_level=None)
+                    for pragma in _PRAGMAS:
+                        instance.db.execute(f"PRAGMA {pragma}")
+                    # The schema never changes at runtime, so its column metadata is read once
+                    cursor = instance.db.execute("SELECT * FROM plate_frame LIMIT 0")
+                    instance.plate_frame_columns = tuple(description[0] for description in cursor.description)
+                    cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        if self.db is None:
-            db_path = Path(__file__).parent / 'skylab-data.db'
-            self.db = sqlite3.connect(str(db_path))
-
     def cursor(self):
         return self.db.cursor()
@@ -1,28 +1,77 @@
 """Pytest configuration and fixtures."""
+from io import BytesIO
+from unittest.mock import MagicMock, Mock
+
 import pytest
+import requests
 
 from skylab2iai import Skylab2iaiCatalog
-from skylab2iai.storage.plate import _SkylabPlateStorage
+from skylab2iai.storage.plate_frame import _SkylabPlateStorage
 from skylab2iai.storage.sql_connection import _SqlStorage
 
 
+@pytest.fixture(scope="session")
+def sql_storage():
+    """SQLite connection singleton shared by the whole session."""
+    return _SqlStorage()
+
+
+@pytest.fixture(scope="session")
+def plate_storage(sql_storage):
+    """Storage singleton shared by the whole session, so the database is opened and cached once."""
+    return _SkylabPlateStorage()
+
+
+@pytest.fixture(scope="session")
+def plate_frames_df(plate_storage):
+    """The full plate frame table, read once and shared by every test that only needs sample rows."""
+    return plate_storage.get_plate_frames()
+
+
 @pytest.fixture(autouse=True)
-def reset_singletons():
-    """Reset all singleton instances before each test."""
-
-    # Store original instances
-    original_sql = _SqlStorage._instance
-    original_plate = _SkylabPlateStorage._instance
-    original_catalog = Skylab2iaiCatalog._instance
-    
-    # Reset for test
-    _SqlStorage._instance = None
-    _SkylabPlateStorage._instance = None
-    Skylab2iaiCatalog._instance = None
-    
+def reset_catalog(monkeypatch, plate_storage):
+    """Give each test its own catalog, and with it a session built under that test's patches."""
+    monkeypatch.setattr(Skylab2iaiCatalog, "_instance", None)
+
+
+@pytest.fixture
+def fresh_singletons(monkeypatch):
+    """Reset every singleton for tests that observe their construction."""
+    monkeypatch.setattr(_SqlStorage, "_instance", None)
+    monkeypatch.setattr(_SkylabPlateStorage, "_instance", None)
+    monkeypatch.setattr(Skylab2iaiCatalog, "_instance", None)
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """Replace the catalog's HTTP session with a mock whose downloads each stream b'test data'.
+
+    Every get() builds a fresh response around ``session.make_raw()``, so concurrent downloads never
+    share a stream; tests override ``make_raw`` to serve a different body.
+    """
+    session = Mock()
+    session.make_raw = lambda: BytesIO(b'test data')
+
+    def respond(*args, **kwargs):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.raw = session.make_raw()
+        return response
+
+    session.get.side_effect = respond
+    monkeypatch.setattr("skylab2iai.catalog.catalog.requests.Session", Mock(return_value=session))
+    return session
+
+
+@pytest.fixture(autouse=True)
+def block_network(monkeypatch):
+    """Keep the suite offline: any real HTTP request fails the test that made it."""
+    attempts = []
+
+    def refuse(adapter, request, *args, **kwargs):
+        attempts.append(request.url)
+        raise requests.exceptions.ConnectionError(f"Network access is disabled in tests: {request.url}")
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", refuse)
     yield
-    
-    # Restore after test (optional, but good practice)
-    _SqlStorage._instance = original_sql
-    _SkylabPlateStorage._instance = original_plate
-    Skylab2iaiCatalog._instance = original_catalog
+    assert not attempts, f"Test reached the network instead of using mock_session: {attempts}"
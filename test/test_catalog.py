@@ -1,27 +1,28 @@
 """Tests for catalog module."""
-from io import UnsupportedOperation
+import inspect
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, UnsupportedOperation
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 import pytest
 import pandas as pd
 import requests
 
 from skylab2iai import Skylab2iaiCatalog
 
+# Public download signatures, resolved once at import instead of inside the tests
+_DOWNLOAD_FITS_PARAMS = tuple(inspect.signature(Skylab2iaiCatalog.download_fits_plate_frames).parameters)
+_DOWNLOAD_FITS_FROM_QUERY_PARAMS = tuple(
+    inspect.signature(Skylab2iaiCatalog.download_fits_plate_frames_from_custom_query).parameters
+)
+
 
 class TestSkylab2iaiCatalog:
     """Test suite for Skylab2iaiCatalog class."""
     
-    def setup_method(self):
-        """Reset singleton instance before each test."""
-        Skylab2iaiCatalog._instance = None
-    
-    def test_singleton_pattern(self):
-        """Test that Skylab2iaiCatalog implements singleton pattern correctly."""
-        catalog1 = Skylab2iaiCatalog()
-        catalog2 = Skylab2iaiCatalog()
-        assert catalog1 is catalog2, "Should return the same instance"
-    
     def test_repository_initialized(self):
         """Test that repository is initialized on first instantiation."""
         catalog = Skylab2iaiCatalog()
@@ -34,24 +35,28 @@ class TestSkylab2iaiCatalog:
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert len(result) > 0, "Should return non-empty DataFrame"
     
-    def test_get_plate_frame(self):
+    def test_get_plate_frame(self, plate_frames_df):
         """Test get_plate_frame method."""
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
-            result = catalog.get_plate_frame(test_name)
-            assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
-            assert len(result) > 0, "Should return results"
+        test_name = plate_frames_df['NAME'].iat[0]
+        result = catalog.get_plate_frame(test_name)
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        assert len(result) > 0, "Should return results"
     
-    def test_get_plate_frames_by_plate(self):
+    def test_get_plate_frames_by_plate(self, plate_frames_df):
         """Test get_plate_frames_by_plate method."""
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
-        if len(all_frames) > 0 and 'PLATE_ID' in all_frames.columns:
-            test_plate_id = all_frames.iloc[0]['PLATE_ID']
-            result = catalog.get_plate_frames_by_plate(test_plate_id)
-            assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        test_plate_id = plate_frames_df['PLATE_ID'].iat[0]
+        result = catalog.get_plate_frames_by_plate(test_plate_id)
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+    
+    def test_get_fits_link(self, plate_frames_df):
+        """Test get_fits_link method."""
+        catalog = Skylab2iaiCatalog()
+        frame = plate_frames_df.iloc[0]
+        result = catalog.get_fits_link(frame['NAME'])
+        assert isinstance(result, str), "Should return a plain string"
+        assert result == frame['LINK_FTS'], "Should return the frame's FITS link"
     
     def test_get_plate_frames_by_query(self):
         """Test get_plate_frames_by_query method."""
@@ -61,40 +66,26 @@ class TestSkylab2iaiCatalog:
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert len(result) <= 5, "Should return at most 5 rows"
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_plate_frames_success(self, mock_session_class):
+    def test_download_fits_plate_frames_success(self, mock_session, plate_frames_df):
         """Test successful FITS file download."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'test data'])
-        mock_response.raise_for_status = Mock()
-        mock_session.get.return_value = mock_response
-        
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
         
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
+        test_name = plate_frames_df['NAME'].iat[0]
+        
+        # Use a temporary directory
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=(test_name,),
+                output_dir=tmpdir
+            )
             
-            # Use a temporary directory
-            import tempfile
-            with tempfile.TemporaryDirectory() as tmpdir:
-                result_df, downloaded_files = catalog.download_fits_plate_frames(
-                    plate_names=(test_name,),
-                    output_dir=tmpdir
-                )
-                
-                assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
-                assert isinstance(downloaded_files, list), "Should return a list of files"
+            assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
+            assert isinstance(downloaded_files, list), "Should return a list of files"
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_plate_frames_nonexistent(self, mock_session_class):
+    def test_download_fits_plate_frames_nonexistent(self, mock_session, caplog):
         """Test downloading non-existent plate frame."""
         catalog = Skylab2iaiCatalog()
         
-        import tempfile
         with tempfile.TemporaryDirectory() as tmpdir:
             result_df, downloaded_files = catalog.download_fits_plate_frames(
                 plate_names=("NONEXISTENT_PLATE_12345",),
@@ -104,108 +95,113 @@ class TestSkylab2iaiCatalog:
             assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
             assert len(result_df) == 0, "Should return empty DataFrame"
             assert len(downloaded_files) == 0, "Should not download any files"
+            assert "NONEXISTENT_PLATE_12345" in caplog.text, "Should log a warning for the missing frame"
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_plate_frames_default_dir(self, mock_session_class):
+    def test_download_fits_plate_frames_default_dir(self, mock_session, plate_frames_df):
         """Test download with default output directory."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'test data'])
-        mock_response.raise_for_status = Mock()
-        mock_session.get.return_value = mock_response
-        
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
         
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
+        test_name = plate_frames_df['NAME'].iat[0]
+        
+        # Clean up default directory if it exists
+        default_dir = Path('./fits_downloads')
+        if default_dir.exists():
+            shutil.rmtree(default_dir)
+        
+        try:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=(test_name,)
+            )
             
-            # Clean up default directory if it exists
-            import shutil
-            default_dir = Path('./fits_downloads')
+            assert default_dir.exists(), "Default directory should be created"
+            assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
+        finally:
+            # Clean up
             if default_dir.exists():
                 shutil.rmtree(default_dir)
-            
-            try:
-                result_df, downloaded_files = catalog.download_fits_plate_frames(
-                    plate_names=(test_name,)
-                )
-                
-                assert default_dir.exists(), "Default directory should be created"
-                assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
-            finally:
-                # Clean up
-                if default_dir.exists():
-                    shutil.rmtree(default_dir)
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_plate_frames_http_error(self, mock_session_class):
+    def test_download_fits_plate_frames_http_error(self, mock_session, plate_frames_df):
         """Test handling of HTTP errors during download."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
         mock_session.get.side_effect = requests.exceptions.HTTPError("404 Not Found")
         
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
         
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
+        test_name = plate_frames_df['NAME'].iat[0]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=(test_name,),
+                output_dir=tmpdir
+            )
             
-            import tempfile
-            with tempfile.TemporaryDirectory() as tmpdir:
-                result_df, downloaded_files = catalog.download_fits_plate_frames(
-                    plate_names=(test_name,),
-                    output_dir=tmpdir
-                )
-                
-                # Should handle error gracefully
-                assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
-                assert len(downloaded_files) == 0, "Should not have downloaded files"
+            # Should handle error gracefully
+            assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
+            assert len(downloaded_files) == 0, "Should not have downloaded files"
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_multiple_frames(self, mock_session_class):
+    def test_download_fits_multiple_frames(self, mock_session, plate_frames_df):
         """Test downloading multiple FITS files."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'test data'])
-        mock_response.raise_for_status = Mock()
-        mock_session.get.return_value = mock_response
+        catalog = Skylab2iaiCatalog()
+        
+        test_names = (plate_frames_df['NAME'].iat[0], plate_frames_df['NAME'].iat[1])
         
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=test_names,
+                output_dir=tmpdir
+            )
+            
+            assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
+            assert len(result_df) >= 1, "Should have results"
+    
+    def test_download_fits_multiple_frames_each_file_written(self, mock_session, plate_frames_df):
+        """Test that every frame of a parallel batch gets its own complete file."""
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
+        test_names = tuple(plate_frames_df['NAME'].iloc[:4])
         
-        if len(all_frames) >= 2:
-            test_names = (all_frames.iloc[0]['NAME'], all_frames.iloc[1]['NAME'])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=test_names,
+                output_dir=tmpdir
+            )
             
-            import tempfile
-            with tempfile.TemporaryDirectory() as tmpdir:
-                result_df, downloaded_files = catalog.download_fits_plate_frames(
-                    plate_names=test_names,
-                    output_dir=tmpdir
-                )
-                
-                assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
-                assert len(result_df) >= 1, "Should have results"
+            assert [path.stem for path in downloaded_files] == list(test_names), "Should download every frame"
+            assert all(path.read_bytes() == b'test data' for path in downloaded_files), \
+                "Every file should hold the full body"
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_from_custom_query_success(self, mock_session_class):
-        """Test downloading FITS files from custom query."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'test data'])
-        mock_response.raise_for_status = Mock()
-        mock_session.get.return_value = mock_response
+    def test_download_fits_multiple_frames_result_order(self, mock_session, plate_frames_df):
+        """Test that the result DataFrame holds every requested frame in request order."""
+        catalog = Skylab2iaiCatalog()
+        test_names = tuple(plate_frames_df['NAME'].iloc[:3])[::-1]
         
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=test_names + ("NONEXISTENT_PLATE_12345",),
+                output_dir=tmpdir
+            )
+            
+            assert list(result_df['NAME']) == list(test_names), "Should keep requested order"
+            assert list(result_df.index) == [0, 1, 2], "Should have a fresh RangeIndex"
+            assert list(result_df.columns) == list(plate_frames_df.columns), "Should keep all columns"
+    
+    def test_download_fits_duplicate_names_collapsed(self, mock_session, plate_frames_df):
+        """Test that repeated plate frame names are only looked up and downloaded once."""
+        catalog = Skylab2iaiCatalog()
+        test_name = plate_frames_df['NAME'].iat[0]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames(
+                plate_names=(test_name, test_name, test_name),
+                output_dir=tmpdir
+            )
+            
+            assert len(result_df) == 1, "Should return the frame once"
+            assert mock_session.get.call_count == 1, "Should download the file once"
+    
+    def test_download_fits_from_custom_query_success(self, mock_session):
+        """Test downloading FITS files from custom query."""
         catalog = Skylab2iaiCatalog()
         query = "SELECT * FROM plate_frame LIMIT 1"
         
-        import tempfile
         with tempfile.TemporaryDirectory() as tmpdir:
             result_df, downloaded_files = catalog.download_fits_plate_frames_from_custom_query(
                 query=query,
@@ -214,13 +210,61 @@ class TestSkylab2iaiCatalog:
             
             assert isinstance(result_df, pd.DataFrame), "Should return a DataFrame"
             assert isinstance(downloaded_files, list), "Should return a list"
+            assert isinstance(result_df["NAME"].dtype, pd.StringDtype), "NAME should use a string dtype"
+            assert isinstance(result_df["LINK_FTS"].dtype, pd.StringDtype), "LINK_FTS should use a string dtype"
+    
+    def test_download_fits_from_custom_query_duplicate_rows_collapsed(self, mock_session):
+        """Test that a query returning the same frame twice only downloads it once."""
+        catalog = Skylab2iaiCatalog()
+        query = "SELECT * FROM (SELECT * FROM plate_frame LIMIT 1) UNION ALL SELECT * FROM (SELECT * FROM plate_frame LIMIT 1)"
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames_from_custom_query(
+                query=query,
+                output_dir=tmpdir
+            )
+            
+            assert len(result_df) == 2, "Should return every row of the query"
+            assert mock_session.get.call_count == 1, "Should download the repeated frame once"
+            assert len(downloaded_files) == 1, "Should report the file once"
+    
+    def test_download_fits_from_custom_query_without_links(self, mock_session):
+        """Test that a query whose rows all lack a FITS link returns without downloading."""
+        catalog = Skylab2iaiCatalog()
+        query = "SELECT NAME, CASE WHEN rowid % 2 THEN '' END AS LINK_FTS FROM plate_frame LIMIT 2"
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result_df, downloaded_files = catalog.download_fits_plate_frames_from_custom_query(
+                query=query,
+                output_dir=tmpdir
+            )
+            
+            assert len(result_df) == 2, "Should return every row of the query"
+            assert downloaded_files == [], "Should not download anything"
+            mock_session.get.assert_not_called()
+    
+    def test_download_fits_from_custom_query_missing_columns(self, mock_session):
+        """Test that a query without the NAME or LINK_FTS column is rejected with a clear error."""
+        catalog = Skylab2iaiCatalog()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(UnsupportedOperation, match="LINK_FTS"):
+                catalog.download_fits_plate_frames_from_custom_query(
+                    query="SELECT NAME FROM plate_frame LIMIT 1",
+                    output_dir=tmpdir
+                )
+            with pytest.raises(UnsupportedOperation, match="NAME"):
+                catalog.download_fits_plate_frames_from_custom_query(
+                    query="SELECT LINK_FTS FROM plate_frame LIMIT 1",
+                    output_dir=tmpdir
+                )
+        mock_session.get.assert_not_called()
     
     def test_download_fits_from_custom_query_no_results(self):
         """Test downloading from query with no results."""
         catalog = Skylab2iaiCatalog()
         query = "SELECT * FROM plate_frame WHERE NAME = 'NONEXISTENT_12345'"
         
-        import tempfile
         with tempfile.TemporaryDirectory() as tmpdir:
             with pytest.raises(UnsupportedOperation, match="No plate frames found"):
                 catalog.download_fits_plate_frames_from_custom_query(
@@ -228,21 +272,11 @@ class TestSkylab2iaiCatalog:
                     output_dir=tmpdir
                 )
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_fits_from_custom_query_default_dir(self, mock_session_class):
+    def test_download_fits_from_custom_query_default_dir(self, mock_session):
         """Test download from custom query with default directory."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'test data'])
-        mock_response.raise_for_status = Mock()
-        mock_session.get.return_value = mock_response
-        
         catalog = Skylab2iaiCatalog()
         query = "SELECT * FROM plate_frame LIMIT 1"
         
-        import shutil
         default_dir = Path('./fits_downloads')
         if default_dir.exists():
             shutil.rmtree(default_dir)
@@ -257,20 +291,12 @@ class TestSkylab2iaiCatalog:
             if default_dir.exists():
                 shutil.rmtree(default_dir)
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_single_file_success(self, mock_session_class):
+    def test_download_single_file_success(self, mock_session):
         """Test _download_single_file helper method."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'test data chunk'])
-        mock_response.raise_for_status = Mock()
-        mock_session.get.return_value = mock_response
+        mock_session.make_raw = lambda: BytesIO(b'test data chunk')
         
         catalog = Skylab2iaiCatalog()
         
-        import tempfile
         with tempfile.TemporaryDirectory() as tmpdir:
             output_path = Path(tmpdir)
             result = catalog._download_single_file(
@@ -280,18 +306,32 @@ class TestSkylab2iaiCatalog:
             )
             
             assert result is not None, "Should return file path"
-            assert "test_plate.fits" in result, "Should contain correct filename"
+            assert isinstance(result, Path), "Should return a Path"
+            assert result.name == "test_plate.fits", "Should use the correct filename"
+            assert result.read_bytes() == b'test data chunk', "Should write the response body"
+    
+    def test_download_single_file_skips_existing(self, mock_session):
+        """Test that _download_single_file does not re-download a complete file."""
+        catalog = Skylab2iaiCatalog()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir)
+            (output_path / "test_plate.fits").write_bytes(b'existing data')
+            result = catalog._download_single_file(
+                url="http://example.com/test.fits",
+                output_dir=output_path,
+                file_prefix="test_plate"
+            )
+            
+            assert result == output_path / "test_plate.fits", "Should return the existing file path"
+            mock_session.get.assert_not_called()
     
-    @patch('skylab2iai.catalog.catalog.requests.Session')
-    def test_download_single_file_error(self, mock_session_class):
+    def test_download_single_file_error(self, mock_session):
         """Test _download_single_file with error."""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
         mock_session.get.side_effect = Exception("Network error")
         
         catalog = Skylab2iaiCatalog()
         
-        import tempfile
         with tempfile.TemporaryDirectory() as tmpdir:
             output_path = Path(tmpdir)
             result = catalog._download_single_file(
@@ -302,6 +342,98 @@ class TestSkylab2iaiCatalog:
             
             assert result is None, "Should return None on error"
     
+    def test_download_single_file_removes_partial_file_on_error(self, mock_session):
+        """Test that a download failing mid-stream leaves no .part file behind."""
+        failing_raw = Mock()
+        failing_raw.read.side_effect = [b'partial data', ConnectionError("Connection reset")]
+        mock_session.make_raw = lambda: failing_raw
+        
+        catalog = Skylab2iaiCatalog()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = Path(tmpdir)
+            result = catalog._download_single_file(
+                url="http://example.com/test.fits",
+                output_dir=output_path,
+                file_prefix="test_plate"
+            )
+            
+            assert result is None, "Should return None on error"
+            assert list(output_path.iterdir()) == [], "Should not leave a partial or final file"
+    
+    def test_session_shared_across_downloads(self, mock_session):
+        """Test that one pooled session is created and reused for every download."""
+        catalog = Skylab2iaiCatalog()
+        Skylab2iaiCatalog()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for prefix in ("plate_a", "plate_b"):
+                catalog._download_single_file(
+                    url="https://example.com/test.fits",
+                    output_dir=Path(tmpdir),
+                    file_prefix=prefix
+                )
+        
+        assert requests.Session.call_count == 1, "Session should be created once"
+        mounted_prefixes = {call.args[0] for call in mock_session.mount.call_args_list}
+        assert mounted_prefixes == {'http://', 'https://'}, "Pooled adapter should serve both schemes"
+        assert mock_session.get.call_count == 2, "Both downloads should use the shared session"
+    
+    @patch('skylab2iai.catalog.catalog.ThreadPoolExecutor', wraps=ThreadPoolExecutor)
+    def test_download_files_sizes_worker_pool(self, mock_executor_class):
+        """Test that the worker pool is sized to the batch unless max_workers is given."""
+        catalog = Skylab2iaiCatalog()
+        catalog._download_single_file = Mock(return_value="file.fits")
+        tasks = [("https://example.com/a.fits", "a"), ("https://example.com/b.fits", "b")]
+        
+        downloaded_files = catalog._download_files(tasks, Path("."))
+        catalog._download_files(tasks, Path("."), max_workers=1)
+        
+        assert downloaded_files == ["file.fits", "file.fits"], "Should collect every downloaded file"
+        assert mock_executor_class.call_args_list[0].kwargs["max_workers"] == 2, "Should not exceed the batch size"
+        assert mock_executor_class.call_args_list[1].kwargs["max_workers"] == 1, "Should honour max_workers"
+        catalog._download_single_file.assert_any_call(
+            url="https://example.com/a.fits", output_dir=Path("."), file_prefix="a"
+        )
+    
+    def test_download_files_empty_batch(self):
+        """Test that an empty task list returns no files without starting a worker pool."""
+        catalog = Skylab2iaiCatalog()
+        assert catalog._download_files([], Path(".")) == [], "Should return an empty list"
+    
+    def test_download_files_preserves_task_order(self):
+        """Test that downloaded paths follow task order even when later tasks finish first."""
+        catalog = Skylab2iaiCatalog()
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+        
+        def fake_download(url, output_dir, file_prefix):
+            time.sleep(delays[file_prefix])
+            return output_dir / f"{file_prefix}.fits"
+        
+        catalog._download_single_file = fake_download
+        tasks = [(f"https://example.com/{name}.fits", name) for name in ("a", "b", "c")]
+        
+        downloaded_files = catalog._download_files(tasks, Path("."))
+        
+        assert [path.stem for path in downloaded_files] == ["a", "b", "c"], "Should keep task order"
+    
+    def test_download_files_logs_failed_future(self, caplog):
+        """Test that an exception raised by a download task is logged with its plate name."""
+        catalog = Skylab2iaiCatalog()
+        catalog._download_single_file = Mock(side_effect=RuntimeError("boom"))
+        
+        downloaded_files = catalog._download_files([("https://example.com/a.fits", "plate_a")], Path("."))
+        
+        assert downloaded_files == [], "Should not report failed downloads"
+        assert "plate_a" in caplog.text, "Should log the failing plate frame"
+    
+    def test_download_signatures(self):
+        """Test that the public download methods keep their documented parameters."""
+        assert _DOWNLOAD_FITS_PARAMS == ("self", "plate_names", "output_dir", "max_workers"), \
+            "download_fits_plate_frames signature changed"
+        assert _DOWNLOAD_FITS_FROM_QUERY_PARAMS == ("self", "query", "output_dir", "max_workers"), \
+            "download_fits_plate_frames_from_custom_query signature changed"
+    
     def test_catalog_import_from_module(self):
         """Test that catalog can be imported from skylab2iai.catalog."""
         from skylab2iai.catalog import Skylab2iaiCatalog as CatalogFromModule
@@ -1,4 +1,9 @@
 """Tests for package initialization."""
+import re
+import subprocess
+import sys
+from pathlib import Path
+
 import skylab2iai
 
 from skylab2iai import Skylab2iaiCatalog
@@ -37,3 +42,25 @@ class TestPackageInit:
         """Test that all items in __all__ are actually exported."""
         for item in skylab2iai.__all__:
             assert hasattr(skylab2iai, item), f"{item} should be accessible from package"
+    
+    def test_version_matches_distribution(self):
+        """Test that __version__ matches the version declared in pyproject.toml."""
+        # Read the same way the publish workflow does, since tomllib needs Python 3.11
+        pyproject = (Path(__file__).parent.parent / "pyproject.toml").read_text()
+        project_version = re.search(r'^version = "([^"]+)"', pyproject, re.MULTILINE).group(1)
+        assert skylab2iai.__version__ == project_version, "__version__ should match pyproject.toml"
+    
+    def test_import_does_not_load_pandas(self):
+        """Test that importing the package defers pandas and requests until the catalog is used."""
+        code = (
+            "import sys, skylab2iai; "
+            "assert 'pandas' not in sys.modules and 'requests' not in sys.modules; "
+            "skylab2iai.Skylab2iaiCatalog; "
+            "assert 'pandas' in sys.modules"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert result.returncode == 0, f"Package import should be lazy: {result.stderr}"
+    
+    def test_catalog_listed_in_dir(self):
+        """Test that the lazily exported catalog is listed by dir()."""
+        assert 'Skylab2iaiCatalog' in dir(skylab2iai), "Skylab2iaiCatalog should be listed by dir()"
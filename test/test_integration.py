@@ -1,10 +1,18 @@
 """Integration tests for the complete workflow."""
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import UnsupportedOperation
 from pathlib import Path
-from unittest.mock import patch, Mock
 import pytest
 import pandas as pd
 
 from skylab2iai import Skylab2iaiCatalog
+from skylab2iai.storage.plate_frame import _SkylabPlateStorage
+from skylab2iai.storage.sql_connection import _SqlStorage
+
+SINGLETONS = pytest.mark.parametrize(
+    "factory", [_SqlStorage, _SkylabPlateStorage, Skylab2iaiCatalog], ids=lambda factory: factory.__name__
+)
 
 
 class TestIntegration:
@@ -21,16 +29,14 @@ class TestIntegration:
         assert len(all_frames) > 0, "Should have data"
         
         # Get specific frame
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
-            specific_frame = catalog.get_plate_frame(test_name)
-            assert len(specific_frame) > 0, "Should find the frame"
-            
-            # Get frames by plate
-            if 'PLATE_ID' in all_frames.columns:
-                plate_id = all_frames.iloc[0]['PLATE_ID']
-                plate_frames = catalog.get_plate_frames_by_plate(plate_id)
-                assert len(plate_frames) > 0, "Should find frames for plate"
+        test_name = all_frames['NAME'].iat[0]
+        specific_frame = catalog.get_plate_frame(test_name)
+        assert len(specific_frame) > 0, "Should find the frame"
+        
+        # Get frames by plate
+        plate_id = all_frames['PLATE_ID'].iat[0]
+        plate_frames = catalog.get_plate_frames_by_plate(plate_id)
+        assert len(plate_frames) > 0, "Should find frames for plate"
     
     def test_custom_query_workflow(self):
         """Test workflow with custom queries."""
@@ -40,54 +46,34 @@ class TestIntegration:
         query1 = "SELECT COUNT(*) as total FROM plate_frame"
         result1 = catalog.get_plate_frames_by_query(query1)
         assert 'total' in result1.columns, "Should have total column"
-        assert result1.iloc[0]['total'] > 0, "Should have records"
+        assert result1['total'].iat[0] > 0, "Should have records"
         
         # Query with LIMIT
         query2 = "SELECT * FROM plate_frame LIMIT 10"
         result2 = catalog.get_plate_frames_by_query(query2)
         assert len(result2) <= 10, "Should respect LIMIT"
     
-    @patch('skylab2iai.catalog.catalog.requests.get')
-    def test_download_workflow(self, mock_get):
+    def test_download_workflow(self, mock_session, plate_frames_df):
         """Test complete download workflow."""
-        # Setup mock
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'FITS data chunk'])
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-        
         catalog = Skylab2iaiCatalog()
-        all_frames = catalog.get_plate_frames()
         
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
+        test_name = plate_frames_df['NAME'].iat[0]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Download single frame
+            df, files = catalog.download_fits_plate_frames(
+                plate_names=(test_name,),
+                output_dir=tmpdir
+            )
             
-            import tempfile
-            with tempfile.TemporaryDirectory() as tmpdir:
-                # Download single frame
-                df, files = catalog.download_fits_plate_frames(
-                    plate_names=(test_name,),
-                    output_dir=tmpdir
-                )
-                
-                assert isinstance(df, pd.DataFrame), "Should return DataFrame"
-                assert isinstance(files, list), "Should return file list"
+            assert isinstance(df, pd.DataFrame), "Should return DataFrame"
+            assert isinstance(files, list), "Should return file list"
     
-    @patch('skylab2iai.catalog.catalog.requests.get')
-    def test_query_and_download_workflow(self, mock_get):
+    def test_query_and_download_workflow(self, mock_session):
         """Test workflow: custom query then download results."""
-        # Setup mock
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'FITS data'])
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
-        
         catalog = Skylab2iaiCatalog()
         query = "SELECT * FROM plate_frame LIMIT 2"
         
-        import tempfile
         with tempfile.TemporaryDirectory() as tmpdir:
             df, files = catalog.download_fits_plate_frames_from_custom_query(
                 query=query,
@@ -115,8 +101,6 @@ class TestIntegration:
         """Test that invalid operations are properly rejected."""
         catalog = Skylab2iaiCatalog()
         
-        from io import UnsupportedOperation
-        
         # Test SQL injection prevention
         with pytest.raises(UnsupportedOperation):
             catalog.get_plate_frames_by_query("SELECT * FROM plate_frame --")
@@ -144,7 +128,7 @@ class TestIntegration:
         # Query for count
         count_query = "SELECT COUNT(*) as count FROM plate_frame"
         count_result = catalog.get_plate_frames_by_query(count_query)
-        query_count = count_result.iloc[0]['count']
+        query_count = count_result['count'].iat[0]
         
         assert total_count == query_count, "Counts should match"
     
@@ -165,3 +149,20 @@ class TestIntegration:
         final_count = len(final_frames)
         
         assert initial_count == final_count, "Data should remain unchanged"
+
+
+class TestSingletons:
+    """Singleton behaviour shared by the connection, storage and catalog classes."""
+    
+    @SINGLETONS
+    def test_singleton_pattern(self, factory, fresh_singletons):
+        """Test that repeated construction returns the same instance."""
+        assert factory() is factory(), f"{factory.__name__} should return the same instance"
+    
+    @SINGLETONS
+    def test_singleton_thread_safe(self, factory, fresh_singletons):
+        """Test that concurrent first constructions all receive the same instance."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(executor.map(lambda _: factory(), range(32)))
+        assert all(instance is instances[0] for instance in instances), \
+            f"{factory.__name__} should return one shared instance"
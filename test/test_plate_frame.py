@@ -9,113 +9,201 @@ from skylab2iai.storage.plate_frame import _SkylabPlateStorage
 class TestSkylabPlateStorage:
     """Test suite for _SkylabPlateStorage class."""
     
-    def setup_method(self):
-        """Reset singleton instance before each test."""
-        _SkylabPlateStorage._instance = None
-    
-    def test_singleton_pattern(self):
-        """Test that _SkylabPlateStorage implements singleton pattern correctly."""
-        storage1 = _SkylabPlateStorage()
-        storage2 = _SkylabPlateStorage()
-        assert storage1 is storage2, "Should return the same instance"
-    
-    def test_get_plate_frames_returns_dataframe(self):
+    def test_get_plate_frames_returns_dataframe(self, plate_storage):
         """Test that get_plate_frames returns a pandas DataFrame."""
-        storage = _SkylabPlateStorage()
-        result = storage.get_plate_frames()
+        result = plate_storage.get_plate_frames()
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert len(result) > 0, "Should return non-empty DataFrame"
     
-    def test_get_plate_frame_by_name(self):
+    def test_get_plate_frame_by_name(self, plate_storage, plate_frames_df):
         """Test retrieving a specific plate frame by name."""
-        storage = _SkylabPlateStorage()
-        # First get all frames to find a valid name
-        all_frames = storage.get_plate_frames()
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
-            result = storage.get_plate_frame(test_name)
-            assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
-            assert len(result) == 1, "Should return exactly one frame"
-            assert result.iloc[0]['NAME'] == test_name, "Should return the correct frame"
-    
-    def test_get_plate_frame_nonexistent(self):
+        test_name = plate_frames_df['NAME'].iat[0]
+        result = plate_storage.get_plate_frame(test_name)
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        assert len(result) == 1, "Should return exactly one frame"
+        assert result['NAME'].iat[0] == test_name, "Should return the correct frame"
+    
+    def test_get_plate_frame_nonexistent(self, plate_storage):
         """Test retrieving a non-existent plate frame."""
-        storage = _SkylabPlateStorage()
-        result = storage.get_plate_frame("NONEXISTENT_PLATE_FRAME_12345")
+        result = plate_storage.get_plate_frame("NONEXISTENT_PLATE_FRAME_12345")
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert len(result) == 0, "Should return empty DataFrame for non-existent frame"
     
-    def test_get_plate_frames_by_plate(self):
+    def test_get_plate_frames_by_plate(self, plate_storage, plate_frames_df):
         """Test retrieving plate frames by plate ID."""
-        storage = _SkylabPlateStorage()
-        # Get a valid plate ID from existing data
-        all_frames = storage.get_plate_frames()
-        if len(all_frames) > 0 and 'PLATE_ID' in all_frames.columns:
-            test_plate_id = all_frames.iloc[0]['PLATE_ID']
-            result = storage.get_plate_frames_by_plate(test_plate_id)
-            assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
-            assert len(result) > 0, "Should return at least one frame"
-            assert all(result['PLATE_ID'] == test_plate_id), "All frames should have the same PLATE_ID"
-    
-    def test_get_plate_frames_by_plate_nonexistent(self):
+        test_plate_id = plate_frames_df['PLATE_ID'].iat[0]
+        result = plate_storage.get_plate_frames_by_plate(test_plate_id)
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        assert len(result) > 0, "Should return at least one frame"
+        assert all(result['PLATE_ID'] == test_plate_id), "All frames should have the same PLATE_ID"
+    
+    def test_get_plate_frames_by_plate_matches_sql(self, plate_storage, plate_frames_df):
+        """Test that indexed plate lookups return the same frames as a SQL filter."""
+        test_plate_id = plate_frames_df['PLATE_ID'].iat[-1]
+        expected = plate_storage.get_from_custom_query("SELECT NAME FROM plate_frame WHERE PLATE_ID = ?", (test_plate_id,))
+        result = plate_storage.get_plate_frames_by_plate(test_plate_id)
+        assert sorted(result['NAME']) == sorted(expected['NAME']), "Should return every frame of the plate"
+    
+    def test_plate_index_csr_layout_matches_groupby(self, plate_storage):
+        """Test that every plate's CSR slice holds exactly the rows pandas groups under it."""
+        frames = plate_storage.get_plate_frames(copy=False)
+        groups = frames.groupby("PLATE_ID", sort=False, observed=True).indices
+        assert len(plate_storage._plate_positions) == len(frames), "Every row with a plate should be indexed once"
+        for plate_id, expected in groups.items():
+            code = plate_storage._plate_map[plate_id]
+            positions = plate_storage._plate_positions[plate_storage._plate_offsets[code]:plate_storage._plate_offsets[code + 1]]
+            assert list(positions) == list(expected), f"Plate {plate_id} should map to its rows in table order"
+    
+    def test_get_plate_frames_by_plate_nonexistent(self, plate_storage):
         """Test retrieving frames for a non-existent plate."""
-        storage = _SkylabPlateStorage()
-        result = storage.get_plate_frames_by_plate("NONEXISTENT_PLATE_12345")
+        result = plate_storage.get_plate_frames_by_plate("NONEXISTENT_PLATE_12345")
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert len(result) == 0, "Should return empty DataFrame for non-existent plate"
     
-    def test_sql_injection_prevention(self):
+    def test_get_link_fts(self, plate_storage, plate_frames_df, monkeypatch):
+        """Test retrieving only the FITS link of a plate frame from the cache, without a query."""
+        monkeypatch.setattr(plate_storage, "_connection", None)
+        frame = plate_frames_df.iloc[0]
+        assert plate_storage.get_link_fts(frame['NAME']) == frame['LINK_FTS'], "Should return the frame's LINK_FTS"
+        assert plate_storage.get_link_fts("NONEXISTENT_PLATE_FRAME_12345") is None, "Should return None when missing"
+    
+    def test_sql_injection_prevention(self, plate_storage):
         """Test that SQL injection attempts are blocked."""
-        storage = _SkylabPlateStorage()
         query = "SELECT * FROM plate_frame WHERE name = 'test' --"
         with pytest.raises(UnsupportedOperation, match="SQL injection is not allowed"):
-            storage.get_from_custom_query(query)
+            plate_storage.get_from_custom_query(query)
     
-    def test_delete_operation_blocked(self):
+    def test_delete_operation_blocked(self, plate_storage):
         """Test that DELETE operations are blocked."""
-        storage = _SkylabPlateStorage()
         query = "DELETE FROM plate_frame WHERE name = 'test'"
         with pytest.raises(UnsupportedOperation, match="Delete operation is not allowed"):
-            storage.get_from_custom_query(query)
+            plate_storage.get_from_custom_query(query)
     
-    def test_update_operation_blocked(self):
+    def test_update_operation_blocked(self, plate_storage):
         """Test that UPDATE operations are blocked."""
-        storage = _SkylabPlateStorage()
         query = "UPDATE plate_frame SET name = 'test' WHERE name = 'other'"
         with pytest.raises(UnsupportedOperation, match="Update operation is not allowed"):
-            storage.get_from_custom_query(query)
+            plate_storage.get_from_custom_query(query)
     
-    def test_insert_operation_blocked(self):
+    def test_insert_operation_blocked(self, plate_storage):
         """Test that INSERT operations are blocked."""
-        storage = _SkylabPlateStorage()
         query = "INSERT INTO plate_frame (name) VALUES ('test')"
         with pytest.raises(UnsupportedOperation, match="Insert operation is not allowed"):
-            storage.get_from_custom_query(query)
+            plate_storage.get_from_custom_query(query)
+    
+    def test_forbidden_operations_blocked_case_insensitive(self, plate_storage):
+        """Test that forbidden statements are blocked regardless of case."""
+        with pytest.raises(UnsupportedOperation, match="Delete operation is not allowed"):
+            plate_storage.get_from_custom_query("delete from plate_frame")
+        with pytest.raises(UnsupportedOperation, match="Drop operation is not allowed"):
+            plate_storage.get_from_custom_query("DROP TABLE plate_frame")
+        with pytest.raises(UnsupportedOperation, match="Alter operation is not allowed"):
+            plate_storage.get_from_custom_query("Alter TABLE plate_frame ADD COLUMN x")
+    
+    def test_comments_and_stacked_statements_blocked(self, plate_storage):
+        """Test that block comments and stacked statements are treated as injection."""
+        for query in ("SELECT * FROM plate_frame /* comment */",
+                      "SELECT * FROM plate_frame; SELECT 1"):
+            with pytest.raises(UnsupportedOperation, match="SQL injection is not allowed"):
+                plate_storage.get_from_custom_query(query)
+        with pytest.raises(UnsupportedOperation, match="Replace operation is not allowed"):
+            plate_storage.get_from_custom_query("  REPLACE INTO plate_frame (name) VALUES ('test')")
+    
+    def test_forbidden_keyword_inside_select_blocked(self, plate_storage):
+        """Test that the SELECT fast path still blocks forbidden keywords later in the query."""
+        with pytest.raises(UnsupportedOperation, match="Drop operation is not allowed"):
+            plate_storage.get_from_custom_query("SELECT * FROM plate_frame WHERE NAME IN (DROP TABLE plate)")
+        with pytest.raises(UnsupportedOperation, match="SQL injection is not allowed"):
+            plate_storage.get_from_custom_query("select * from plate_frame; DELETE FROM plate_frame")
     
-    def test_custom_query_select_allowed(self):
+    def test_custom_query_replace_function_allowed(self, plate_storage):
+        """Test that SQLite's replace() function is still allowed inside a SELECT."""
+        result = plate_storage.get_from_custom_query("SELECT replace(NAME, '_', '-') AS name FROM plate_frame LIMIT 1;")
+        assert len(result) == 1, "Should run the query"
+    
+    def test_custom_query_select_allowed(self, plate_storage):
         """Test that SELECT queries are allowed in custom queries."""
-        storage = _SkylabPlateStorage()
         query = "SELECT * FROM plate_frame LIMIT 5"
-        result = storage.get_from_custom_query(query)
+        result = plate_storage.get_from_custom_query(query)
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert len(result) <= 5, "Should return at most 5 rows"
     
-    def test_custom_query_with_params(self):
+    def test_custom_query_with_params(self, plate_storage, plate_frames_df):
         """Test custom query with parameters."""
-        storage = _SkylabPlateStorage()
-        all_frames = storage.get_plate_frames()
-        if len(all_frames) > 0:
-            test_name = all_frames.iloc[0]['NAME']
-            query = "SELECT * FROM plate_frame WHERE NAME = ?"
-            result = storage.get_from_custom_query(query, params=(test_name,))
-            assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
-            assert len(result) > 0, "Should return results"
-    
-    def test_custom_query_with_where_clause(self):
+        test_name = plate_frames_df['NAME'].iat[0]
+        query = "SELECT * FROM plate_frame WHERE NAME = ?"
+        result = plate_storage.get_from_custom_query(query, params=(test_name,))
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        assert len(result) > 0, "Should return results"
+    
+    def test_custom_query_matches_read_sql_query(self, plate_storage):
+        """Test that the raw-cursor reader returns the same frame as pandas.read_sql_query."""
+        query = "SELECT PLATE_ID, AVG(EXPOSURE_TIME) AS exposure, COUNT(*) AS frames FROM plate_frame GROUP BY PLATE_ID"
+        expected = pd.read_sql_query(query, plate_storage._connection.db)
+        pd.testing.assert_frame_equal(plate_storage.get_from_custom_query(query), expected)
+    
+    def test_custom_query_with_where_clause(self, plate_storage):
         """Test custom query with WHERE clause."""
-        storage = _SkylabPlateStorage()
         query = "SELECT COUNT(*) as count FROM plate_frame"
-        result = storage.get_from_custom_query(query)
+        result = plate_storage.get_from_custom_query(query)
         assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
         assert 'count' in result.columns, "Should have count column"
-        assert result.iloc[0]['count'] > 0, "Should have some records"
+        assert result['count'].iat[0] > 0, "Should have some records"
+    
+    def test_get_plate_frames_is_cached(self, plate_storage):
+        """Test that the plate frame table is read from the database only once."""
+        plate_storage.get_plate_frames()
+        cached = plate_storage._all_frames_cache
+        plate_storage.get_plate_frames()
+        assert plate_storage._all_frames_cache is cached, "Should reuse the cached table"
+    
+    def test_get_plate_frames_returns_independent_copy(self, plate_storage):
+        """Test that mutating a returned DataFrame does not affect the cache."""
+        frames = plate_storage.get_plate_frames()
+        original_name = frames['NAME'].iat[0]
+        frames.loc[0, 'NAME'] = "MUTATED"
+        assert plate_storage.get_plate_frames()['NAME'].iat[0] == original_name, "Cache should be unchanged"
+    
+    def test_get_plate_frames_without_copy_returns_cache(self, plate_storage):
+        """Test that copy=False returns the cached table itself."""
+        frames = plate_storage.get_plate_frames(copy=False)
+        assert frames is plate_storage._all_frames_cache, "Should return the cached table without copying"
+        assert plate_storage.get_plate_frames() is not frames, "Default should still return a copy"
+    
+    def test_lookup_results_keep_plain_string_columns(self, plate_storage, plate_frames_df):
+        """Test that returned frames keep plain string columns that accept new values."""
+        for column in ("PLATE_ID", "MODE_NAME"):
+            assert not isinstance(plate_frames_df[column].dtype, pd.CategoricalDtype), f"{column} should not be categorical"
+        result = plate_storage.get_plate_frame(plate_frames_df['NAME'].iat[0])
+        result.loc[0, 'PLATE_ID'] = "NEW_PLATE"
+        assert result['PLATE_ID'].iat[0] == "NEW_PLATE", "Should accept a value outside the existing plates"
+    
+    def test_get_plate_frames_in(self, plate_storage, plate_frames_df):
+        """Test retrieving several plate frames with a single query."""
+        test_names = tuple(plate_frames_df['NAME'].iloc[:3])
+        result = plate_storage.get_plate_frames_in(test_names + ("NONEXISTENT_PLATE_FRAME_12345",))
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        assert sorted(result['NAME']) == sorted(test_names), "Should return only the existing frames"
+    
+    def test_get_plate_frames_in_matches_full_table(self, plate_storage, plate_frames_df):
+        """Test that batch lookups keep request order and the full table's dtypes."""
+        test_names = tuple(plate_frames_df['NAME'].iloc[[2, 0, 1]])
+        result = plate_storage.get_plate_frames_in(test_names + test_names[:1])
+        assert list(result['NAME']) == list(test_names), "Should return each frame once, in request order"
+        assert result.dtypes.equals(plate_frames_df.dtypes), "Should keep the full table's dtypes"
+    
+    def test_get_plate_frames_in_empty(self, plate_storage):
+        """Test that an empty name tuple returns an empty DataFrame."""
+        result = plate_storage.get_plate_frames_in(())
+        assert isinstance(result, pd.DataFrame), "Should return a DataFrame"
+        assert len(result) == 0, "Should return empty DataFrame"
+    
+    def test_get_plate_frame_lookup_is_memoized(self, plate_storage, plate_frames_df):
+        """Test that repeat lookups reuse the memoized frame but return independent copies."""
+        test_name = plate_frames_df['NAME'].iat[0]
+        first = plate_storage.get_plate_frame(test_name)
+        first.loc[0, 'NAME'] = "MUTATED"
+        hits = plate_storage._frame_by_name.cache_info().hits
+        second = plate_storage.get_plate_frame(test_name)
+        assert plate_storage._frame_by_name.cache_info().hits == hits + 1, "Second lookup should be a cache hit"
+        assert second['NAME'].iat[0] == test_name, "Memoized frame should be unchanged"
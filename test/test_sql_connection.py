@@ -1,5 +1,6 @@
 """Tests for SQL connection module."""
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pytest
 
@@ -9,47 +10,61 @@ from skylab2iai.storage.sql_connection import _SqlStorage
 class TestSqlStorage:
     """Test suite for _SqlStorage singleton class."""
     
-    def setup_method(self):
-        """Reset singleton instance before each test."""
-        _SqlStorage._instance = None
-    
-    def test_singleton_pattern(self):
-        """Test that _SqlStorage implements singleton pattern correctly."""
-        storage1 = _SqlStorage()
-        storage2 = _SqlStorage()
-        assert storage1 is storage2, "Should return the same instance"
-    
-    def test_database_connection_initialized(self):
+    def test_database_connection_initialized(self, sql_storage):
         """Test that database connection is properly initialized."""
-        storage = _SqlStorage()
-        assert storage.db is not None, "Database connection should be initialized"
-        assert isinstance(storage.db, sqlite3.Connection), "Should be a sqlite3 Connection"
+        assert sql_storage.db is not None, "Database connection should be initialized"
+        assert isinstance(sql_storage.db, sqlite3.Connection), "Should be a sqlite3 Connection"
     
     def test_database_file_exists(self):
         """Test that the database file exists."""
-        storage = _SqlStorage()
         db_path = Path(__file__).parent.parent / 'src' / 'skylab2iai' / 'storage' / 'skylab-data.db'
         assert db_path.exists(), f"Database file should exist at {db_path}"
     
-    def test_cursor_method(self):
+    def test_cursor_method(self, sql_storage):
         """Test that cursor method returns a valid cursor."""
-        storage = _SqlStorage()
-        cursor = storage.cursor()
+        cursor = sql_storage.cursor()
         assert cursor is not None, "Cursor should not be None"
         assert isinstance(cursor, sqlite3.Cursor), "Should return a sqlite3 Cursor"
     
-    def test_database_has_plate_frame_table(self):
+    def test_database_has_plate_frame_table(self, sql_storage):
         """Test that database contains the plate_frame table."""
-        storage = _SqlStorage()
-        cursor = storage.cursor()
+        cursor = sql_storage.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='PLATE_FRAME'")
         result = cursor.fetchone()
         assert result is not None, "plate_frame table should exist"
     
-    def test_multiple_instantiation_same_db(self):
+    def test_plate_frame_columns_cached(self, sql_storage):
+        """Test that the plate_frame column names are read once at connection time."""
+        assert isinstance(sql_storage.plate_frame_columns, tuple), "Columns should be cached as a tuple"
+        assert "NAME" in sql_storage.plate_frame_columns, "Should include the NAME column"
+        assert "LINK_FTS" in sql_storage.plate_frame_columns, "Should include the LINK_FTS column"
+    
+    def test_multiple_instantiation_same_db(self, fresh_singletons):
         """Test that multiple instantiations use the same database connection."""
         storage1 = _SqlStorage()
         db1 = storage1.db
         storage2 = _SqlStorage()
         db2 = storage2.db
         assert db1 is db2, "Should use the same database connection"
+    
+    def test_database_is_read_only(self, sql_storage):
+        """Test that the embedded database is opened read-only."""
+        with pytest.raises(sqlite3.OperationalError):
+            sql_storage.db.execute("CREATE TABLE should_not_exist (id INTEGER)")
+        assert sql_storage.db.isolation_level is None, "Read-only connection should run in autocommit mode"
+        assert sql_storage.db.execute("PRAGMA query_only").fetchone()[0] == 1, "query_only should be enabled"
+    
+    def test_connection_usable_from_other_threads(self, sql_storage):
+        """Test that the shared connection can be used by worker threads."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            count = executor.submit(
+                lambda: sql_storage.db.execute("SELECT COUNT(*) FROM plate_frame").fetchone()[0]
+            ).result()
+        assert count > 0, "Worker thread should be able to query the database"
+    
+    def test_plate_id_lookups_use_index(self, sql_storage):
+        """Test that custom queries filtering on PLATE_ID use the shipped index instead of a table scan."""
+        plan = sql_storage.db.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM plate_frame WHERE PLATE_ID = ?", ("plate",)
+        ).fetchall()
+        assert any("USING INDEX" in step[-1] for step in plan), "PLATE_ID lookup should use an index"